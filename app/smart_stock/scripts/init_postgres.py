@@ -27,12 +27,12 @@ def main():
     """Initialize PostgreSQL database with tables and sample data."""
     try:
         # Import after env vars are loaded
-        from server.postgres_database import LakebasePostgresConnection
+        # Reuse the module-level instance instead of building a second pool
+        from server.postgres_database import db
         
         logger.info("Starting PostgreSQL database initialization...")
         
-        # Create database connection
-        db = LakebasePostgresConnection()
+        db.open()
         logger.info("PostgreSQL connection established")
         
         # Create tables
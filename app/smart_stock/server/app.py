@@ -144,18 +144,18 @@ async def debug_db_test():
     conn = psycopg2.connect(**db_config, cursor_factory=RealDictCursor)
     cursor = conn.cursor()
 
-    # Count transactions
+    # Count transactions, products and warehouses in a single round trip
     schema = os.getenv('DB_SCHEMA', 'public')
-    cursor.execute(f"SELECT COUNT(*) as count FROM {schema}.inventory_transactions")
-    transaction_count = cursor.fetchone()['count']
-
-    # Count products
-    cursor.execute(f"SELECT COUNT(*) as count FROM {schema}.products")
-    product_count = cursor.fetchone()['count']
-
-    # Count warehouses
-    cursor.execute(f"SELECT COUNT(*) as count FROM {schema}.warehouses")
-    warehouse_count = cursor.fetchone()['count']
+    cursor.execute(f"""
+      SELECT
+        (SELECT COUNT(*) FROM {schema}.inventory_transactions) as transaction_count,
+        (SELECT COUNT(*) FROM {schema}.products) as product_count,
+        (SELECT COUNT(*) FROM {schema}.warehouses) as warehouse_count
+    """)
+    counts = cursor.fetchone()
+    transaction_count = counts['transaction_count']
+    product_count = counts['product_count']
+    warehouse_count = counts['warehouse_count']
 
     cursor.close()
     conn.close()
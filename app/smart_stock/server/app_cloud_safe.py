@@ -2,6 +2,7 @@
 
 import os
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -477,12 +478,18 @@ async def init_database():
 # SAFE API ROUTES - Direct implementations to avoid import issues
 # ============================================================================
 
+@lru_cache(maxsize=1)
+def get_workspace_client():
+    """Return a WorkspaceClient shared across requests."""
+    from databricks.sdk import WorkspaceClient
+    return WorkspaceClient()
+
+
 @app.get('/api/user/me')
 async def get_current_user():
     """Get current user info from Databricks context."""
     try:
-        from databricks.sdk import WorkspaceClient
-        w = WorkspaceClient()
+        w = get_workspace_client()
         user = w.current_user.me()
         return {
             'userName': user.user_name or 'unknown',
@@ -1,13 +1,15 @@
 """PostgreSQL/Lakebase connection module for food & beverage inventory."""
 
+import atexit
 import os
 import logging
+import threading
 from typing import Optional, Any, Dict, List
 from contextlib import contextmanager
 from pathlib import Path
 import psycopg2
 from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_batch
 
 # Load environment variables only in development
 try:
@@ -43,35 +45,80 @@ class LakebasePostgresConnection:
         if not all([self.db_config["host"], self.db_config["user"], self.db_config["password"]]):
             raise ValueError("DB_HOST, DB_USER, and DB_PASSWORD must be set in environment variables")
 
-        # Create connection pool
+        # The pool is opened on first use so importing this module never blocks on the network
+        self.connection_pool = None
+        self._pool_lock = threading.Lock()
+        atexit.register(self.close)
+
+        # Warm the pool in the background so the first request doesn't pay TLS + auth
+        threading.Thread(target=self._warm, name="lakebase-pool-warmup", daemon=True).start()
+
+    def _warm(self):
+        """Open the pool and run SELECT 1 on each of its initial connections."""
         try:
-            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=20,
-                **self.db_config
-            )
-            logger.info(f"Connected to Lakebase PostgreSQL at {self.db_config['host']}")
+            self.open()
+            connection_pool = self.connection_pool
+            connections = []
+            try:
+                # Hold each connection until done so the loop touches minconn distinct ones
+                for _ in range(connection_pool.minconn):
+                    conn = connection_pool.getconn()
+                    connections.append(conn)
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                    conn.rollback()
+            finally:
+                for conn in connections:
+                    connection_pool.putconn(conn)
+            logger.info(f"Warmed {len(connections)} Lakebase connections")
         except Exception as e:
-            logger.error(f"Failed to create connection pool: {e}")
-            raise
+            logger.warning(f"Connection pool warm-up failed, will connect on first use: {e}")
+
+    def open(self):
+        """Open the connection pool if it isn't open yet."""
+        if self.connection_pool is not None:
+            return
+        with self._pool_lock:
+            if self.connection_pool is not None:
+                return
+            try:
+                # Keep enough warm connections for typical request concurrency so
+                # callers don't pay TLS + auth on demand
+                self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
+                    minconn=int(os.getenv("DB_POOL_MIN_SIZE", 4)),
+                    maxconn=int(os.getenv("DB_POOL_MAX_SIZE", 20)),
+                    **self.db_config
+                )
+                logger.info(f"Connected to Lakebase PostgreSQL at {self.db_config['host']}")
+            except Exception as e:
+                logger.error(f"Failed to create connection pool: {e}")
+                raise
 
     @contextmanager
     def get_connection(self):
         """Context manager for database connections."""
+        self.open()
+        connection_pool = self.connection_pool
         connection = None
         try:
-            connection = self.connection_pool.getconn()
+            connection = connection_pool.getconn()
             yield connection
         finally:
             if connection:
-                self.connection_pool.putconn(connection)
+                connection_pool.putconn(connection)
 
     @contextmanager
-    def get_cursor(self, dict_cursor=True):
-        """Context manager for database cursor."""
+    def get_cursor(self, dict_cursor=True, autocommit=False):
+        """Context manager for database cursor.
+
+        With autocommit=True the statement runs without the implicit BEGIN/COMMIT
+        round-trips, which is safe for callers that issue a single statement.
+        """
         with self.get_connection() as conn:
             cursor = None
             try:
+                if autocommit:
+                    conn.autocommit = True
                 cursor_factory = RealDictCursor if dict_cursor else None
                 cursor = conn.cursor(cursor_factory=cursor_factory)
                 yield cursor
@@ -83,10 +130,13 @@ class LakebasePostgresConnection:
             finally:
                 if cursor:
                     cursor.close()
+                # Pooled connections must go back in the default transactional mode
+                if autocommit and not conn.closed:
+                    conn.autocommit = False
 
     def execute_query(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """Execute a query and return results as list of dictionaries."""
-        with self.get_cursor(dict_cursor=True) as cursor:
+        with self.get_cursor(dict_cursor=True, autocommit=True) as cursor:
             cursor.execute(query, params)
             if cursor.description:
                 return cursor.fetchall()
@@ -94,10 +144,21 @@ class LakebasePostgresConnection:
 
     def execute_update(self, query: str, params: Optional[tuple] = None) -> int:
         """Execute an update/insert/delete query and return affected rows."""
-        with self.get_cursor(dict_cursor=False) as cursor:
+        with self.get_cursor(dict_cursor=False, autocommit=True) as cursor:
             cursor.execute(query, params)
             return cursor.rowcount
 
+    def execute_many(self, query: str, rows: List[tuple], page_size: int = 100) -> None:
+        """Execute a parameterized statement for many rows, sending page_size rows per round-trip."""
+        with self.get_cursor(dict_cursor=False) as cursor:
+            execute_batch(cursor, query, rows, page_size=page_size)
+
+    def execute_script(self, statements: List[str]) -> None:
+        """Execute several parameterless statements in one round-trip and one transaction."""
+        # A multi-statement simple query already runs as one implicit transaction
+        with self.get_cursor(dict_cursor=False, autocommit=True) as cursor:
+            cursor.execute(";\n".join(statements))
+
     def create_tables(self):
         """Create all required tables for the food & beverage inventory management system."""
 
@@ -117,12 +178,18 @@ class LakebasePostgresConnection:
             "DROP TABLE IF EXISTS stores CASCADE"
         ]
 
-        for drop_stmt in drop_tables:
-            try:
-                self.execute_update(drop_stmt)
-                logger.info(f"Dropped table: {drop_stmt}")
-            except Exception as e:
-                logger.warning(f"Error dropping table: {e}")
+        try:
+            self.execute_script(drop_tables)
+            logger.info(f"Dropped {len(drop_tables)} tables")
+        except Exception as e:
+            # Fall back to one statement at a time so a single failure doesn't block the rest
+            logger.warning(f"Batched drop failed, retrying individually: {e}")
+            for drop_stmt in drop_tables:
+                try:
+                    self.execute_update(drop_stmt)
+                    logger.info(f"Dropped table: {drop_stmt}")
+                except Exception as e:
+                    logger.warning(f"Error dropping table: {e}")
 
         # Create tables in correct dependency order
 
@@ -306,12 +373,18 @@ class LakebasePostgresConnection:
             "CREATE INDEX IF NOT EXISTS idx_products_expiration ON products(expiration_days)"
         ]
 
-        for index_ddl in indexes:
-            try:
-                self.execute_update(index_ddl)
-                logger.info(f"Created index: {index_ddl}")
-            except Exception as e:
-                logger.warning(f"Could not create index: {e}")
+        try:
+            self.execute_script(indexes)
+            logger.info(f"Created {len(indexes)} indexes")
+        except Exception as e:
+            # Fall back to one statement at a time so a single failure doesn't block the rest
+            logger.warning(f"Batched index creation failed, retrying individually: {e}")
+            for index_ddl in indexes:
+                try:
+                    self.execute_update(index_ddl)
+                    logger.info(f"Created index: {index_ddl}")
+                except Exception as e:
+                    logger.warning(f"Could not create index: {e}")
 
         logger.info("All enhanced food inventory tables created successfully")
 
@@ -329,11 +402,10 @@ class LakebasePostgresConnection:
             ('The Garden Restaurant', '321 Organic Blvd, San Francisco, CA 94105', 'restaurant', 5, 'America/Los_Angeles')
         ]
 
-        for store in stores_data:
-            self.execute_update(
-                "INSERT INTO stores (name, location, type, manager_id, timezone) VALUES (%s, %s, %s, %s, %s)",
-                store
-            )
+        self.execute_many(
+            "INSERT INTO stores (name, location, type, manager_id, timezone) VALUES (%s, %s, %s, %s, %s)",
+            stores_data
+        )
         logger.info("Inserted 5 stores")
 
         # 2. Insert customers (no dependencies)
@@ -345,11 +417,10 @@ class LakebasePostgresConnection:
             ('Artisan Bakery Collective', 'ingredients@artisanbakery.com', '503-555-0105', '500 Baker Street, Portland, OR', 'retail')
         ]
 
-        for customer in customers_data:
-            self.execute_update(
-                "INSERT INTO customers (name, email, phone, address, customer_type) VALUES (%s, %s, %s, %s, %s)",
-                customer
-            )
+        self.execute_many(
+            "INSERT INTO customers (name, email, phone, address, customer_type) VALUES (%s, %s, %s, %s, %s)",
+            customers_data
+        )
         logger.info("Inserted 5 customers")
 
         # 3. Insert comprehensive food products (no dependencies)
@@ -390,13 +461,12 @@ class LakebasePostgresConnection:
             ('Sparkling Water', 'Natural sparkling water', 'BEV-003', 2.99, '1L bottle', 'Water', 100, 365, 'Room Temperature', None, False)
         ]
 
-        for product in products_data:
-            self.execute_update(
-                """INSERT INTO products (name, description, sku, price, unit, category, reorder_level,
-                   expiration_days, storage_temp, allergens, organic)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
-                product
-            )
+        self.execute_many(
+            """INSERT INTO products (name, description, sku, price, unit, category, reorder_level,
+               expiration_days, storage_temp, allergens, organic)
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+            products_data
+        )
         logger.info("Inserted 23 comprehensive food products")
 
         # 4. Insert suppliers (no dependencies)
@@ -409,11 +479,10 @@ class LakebasePostgresConnection:
             ('Cascade Coffee Roasters', '{"email": "wholesale@cascadecoffee.com", "phone": "503-555-0206", "address": "6000 Roastery Ave, Portland, OR"}', 1, 0.97, 'Coffee & Tea', 'Fair Trade, Organic, Rainforest Alliance')
         ]
 
-        for supplier in suppliers_data:
-            self.execute_update(
-                "INSERT INTO suppliers (name, contact_info, lead_time_days, reliability_score, specialty, certifications) VALUES (%s, %s, %s, %s, %s, %s)",
-                supplier
-            )
+        self.execute_many(
+            "INSERT INTO suppliers (name, contact_info, lead_time_days, reliability_score, specialty, certifications) VALUES (%s, %s, %s, %s, %s, %s)",
+            suppliers_data
+        )
         logger.info("Inserted 6 food suppliers")
 
         # 5. Insert product-supplier relationships (depends on products and suppliers)
@@ -444,11 +513,10 @@ class LakebasePostgresConnection:
             (23, 6, True, 8.75, 24, '2025-01-11')
         ]
 
-        for ps_data in product_suppliers_data:
-            self.execute_update(
-                "INSERT INTO product_suppliers (product_id, supplier_id, is_primary, unit_cost, min_order_qty, last_order_date) VALUES (%s, %s, %s, %s, %s, %s)",
-                ps_data
-            )
+        self.execute_many(
+            "INSERT INTO product_suppliers (product_id, supplier_id, is_primary, unit_cost, min_order_qty, last_order_date) VALUES (%s, %s, %s, %s, %s, %s)",
+            product_suppliers_data
+        )
         logger.info("Inserted product-supplier relationships")
 
         # 6. Insert current inventory levels (depends on products and stores)
@@ -471,11 +539,10 @@ class LakebasePostgresConnection:
             (21, 3, 25, 20, 5, '2025-01-15', 'Manager Alex')
         ]
 
-        for inventory in inventory_current_data:
-            self.execute_update(
-                "INSERT INTO inventory_current (product_id, store_id, quantity_on_hand, quantity_available, quantity_reserved, last_counted_date, last_count_by) VALUES (%s, %s, %s, %s, %s, %s, %s)",
-                inventory
-            )
+        self.execute_many(
+            "INSERT INTO inventory_current (product_id, store_id, quantity_on_hand, quantity_available, quantity_reserved, last_counted_date, last_count_by) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            inventory_current_data
+        )
         logger.info("Inserted current inventory levels")
 
         # 7. Insert recent orders (depends on products, customers, stores)
@@ -488,11 +555,10 @@ class LakebasePostgresConnection:
             ('ORD-2025-F006', 12, 5, 1, 24, 'Artisan Bakery Collective', 'delivered', 'Free-range eggs for pastries', '2025-01-13 16:00:00')
         ]
 
-        for order in orders_data:
-            self.execute_update(
-                "INSERT INTO orders (order_number, product_id, customer_id, store_id, quantity, requested_by, status, notes, order_date) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
-                order
-            )
+        self.execute_many(
+            "INSERT INTO orders (order_number, product_id, customer_id, store_id, quantity, requested_by, status, notes, order_date) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            orders_data
+        )
         logger.info("Inserted 6 food orders")
 
         # 8. Insert ML-generated inventory forecasts (depends on products and stores)
@@ -511,11 +577,10 @@ class LakebasePostgresConnection:
             (21, 3, 25, 75, 15, 30, 0.87, 'active')
         ]
 
-        for forecast in forecasts_data:
-            self.execute_update(
-                "INSERT INTO inventory_forecast (product_id, store_id, current_stock, forecast_30_days, reorder_point, reorder_quantity, confidence_score, status) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
-                forecast
-            )
+        self.execute_many(
+            "INSERT INTO inventory_forecast (product_id, store_id, current_stock, forecast_30_days, reorder_point, reorder_quantity, confidence_score, status) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+            forecasts_data
+        )
         logger.info("Inserted inventory forecasts")
 
         # 9. Insert some stockout events for analysis (depends on products and stores)
@@ -525,11 +590,10 @@ class LakebasePostgresConnection:
             (7, 1, '2025-01-11 12:00:00', '2025-01-12 08:00:00', 89.85, 'Organic tomato supplier truck breakdown')
         ]
 
-        for stockout in stockout_events_data:
-            self.execute_update(
-                "INSERT INTO stockout_events (product_id, store_id, stockout_start, stockout_end, lost_sales_estimate, root_cause) VALUES (%s, %s, %s, %s, %s, %s)",
-                stockout
-            )
+        self.execute_many(
+            "INSERT INTO stockout_events (product_id, store_id, stockout_start, stockout_end, lost_sales_estimate, root_cause) VALUES (%s, %s, %s, %s, %s, %s)",
+            stockout_events_data
+        )
         logger.info("Inserted stockout events")
 
         logger.info("✅ Comprehensive food & beverage inventory system seeded successfully!")
@@ -721,9 +785,11 @@ class LakebasePostgresConnection:
 
     def close(self):
         """Close all connections in the pool."""
-        if hasattr(self, 'connection_pool'):
-            self.connection_pool.closeall()
-            logger.info("Connection pool closed")
+        with self._pool_lock:
+            if self.connection_pool is not None:
+                self.connection_pool.closeall()
+                self.connection_pool = None
+                logger.info("Connection pool closed")
 
 
 # Global database instance
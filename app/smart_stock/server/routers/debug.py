@@ -73,12 +73,13 @@ async def check_db_status():
     try:
         from ..db_selector import db
 
-        # Test query
-        products = db.execute_query("SELECT COUNT(*) as count FROM products")
-        product_count = products[0]['count'] if products else 0
-
-        warehouses = db.execute_query("SELECT COUNT(*) as count FROM warehouses")
-        warehouse_count = warehouses[0]['count'] if warehouses else 0
+        # Test query - both counts in one round trip
+        counts = db.execute_query(
+            "SELECT (SELECT COUNT(*) FROM products) as product_count, "
+            "(SELECT COUNT(*) FROM warehouses) as warehouse_count"
+        )
+        product_count = counts[0]['product_count'] if counts else 0
+        warehouse_count = counts[0]['warehouse_count'] if counts else 0
 
         connection_status = "Connected via db_selector"
     except Exception as e:
@@ -2,7 +2,8 @@
 
 import os
 import logging
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 
 import httpx
 from fastapi import APIRouter, HTTPException
@@ -15,6 +16,11 @@ router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 # Demo reset job ID
 DEMO_RESET_JOB_ID = 60972489698708
 
+# Every open reset dialog polls run status every 3s; cache responses briefly so
+# concurrent viewers share one Jobs API call per run per window
+RUN_STATUS_TTL_SECONDS = 3.0
+_run_status_cache: Dict[int, Tuple[float, "JobRunResponse"]] = {}
+
 
 class JobRunResponse(BaseModel):
     """Response model for job run."""
@@ -226,6 +232,10 @@ async def trigger_demo_reset():
 @router.get("/demo-reset/run/{run_id}", response_model=JobRunResponse)
 async def get_run_status(run_id: int):
     """Get the status of a specific job run."""
+    cached = _run_status_cache.get(run_id)
+    if cached and time.monotonic() - cached[0] < RUN_STATUS_TTL_SECONDS:
+        return cached[1]
+
     try:
         host, token = get_databricks_client()
         headers = {"Authorization": f"Bearer {token}"}
@@ -244,7 +254,7 @@ async def get_run_status(run_id: int):
             run = response.json()
             state = run.get("state", {})
             
-            return JobRunResponse(
+            result = JobRunResponse(
                 run_id=run.get("run_id"),
                 job_id=run.get("job_id"),
                 state=state.get("life_cycle_state", "UNKNOWN"),
@@ -253,6 +263,12 @@ async def get_run_status(run_id: int):
                 state_message=state.get("state_message"),
                 run_page_url=run.get("run_page_url")
             )
+
+            now = time.monotonic()
+            for stale_id in [k for k, (ts, _) in _run_status_cache.items() if now - ts >= RUN_STATUS_TTL_SECONDS]:
+                del _run_status_cache[stale_id]
+            _run_status_cache[run_id] = (now, result)
+            return result
             
     except HTTPException:
         raise
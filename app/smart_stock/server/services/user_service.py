@@ -1,15 +1,23 @@
 """User service for Databricks user operations."""
 
+from functools import lru_cache
+
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.iam import User
 
 
+@lru_cache(maxsize=1)
+def get_workspace_client() -> WorkspaceClient:
+  """Get the process-wide workspace client, resolving auth only on first use."""
+  return WorkspaceClient()
+
+
 class UserService:
   """Service for managing Databricks user operations."""
 
   def __init__(self):
     """Initialize the user service with Databricks workspace client."""
-    self.client = WorkspaceClient()
+    self.client = get_workspace_client()
 
   def get_current_user(self) -> User:
     """Get the current authenticated user."""
@@ -1,40 +1,65 @@
 # Databricks notebook source
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from databricks.sdk import WorkspaceClient
 
 w = WorkspaceClient()
 
 # COMMAND ----------
 
-dbutils.widgets.text("dim_product_pipeline_id", "")
-dbutils.widgets.text("dim_warehouse_pipeline_id", "")
-dbutils.widgets.text("fact_transactions_pipeline_id", "")
-dbutils.widgets.text("inventory_historical_pipeline_id", "")
+# (display name, widget holding the pipeline ID)
+PIPELINES = [
+    ("Dim Product", "dim_product_pipeline_id"),
+    ("Dim Warehouse", "dim_warehouse_pipeline_id"),
+    ("Inventory Transactions", "fact_transactions_pipeline_id"),
+    ("Inventory Historical", "inventory_historical_pipeline_id"),
+]
+
+for _, widget in PIPELINES:
+    dbutils.widgets.text(widget, "")
 
-dim_product_pipeline_id = dbutils.widgets.get("dim_product_pipeline_id")
-dim_warehouse_pipeline_id = dbutils.widgets.get("dim_warehouse_pipeline_id")
-inventory_transaction_pipeline_id = dbutils.widgets.get("fact_transactions_pipeline_id")
-inventory_historical_pipeline_id = dbutils.widgets.get("inventory_historical_pipeline_id")
+pipelines = {name: dbutils.widgets.get(widget) for name, widget in PIPELINES}
 
 # COMMAND ----------
 
-# Dim Product
-dim_product_update = w.pipelines.start_update(pipeline_id=dim_product_pipeline_id, full_refresh=True)
-print(f"Dim Product update ID: {dim_product_update.update_id}")
+class TokenBucket:
+    """Token-bucket rate limiter so adding pipelines can't exceed the Pipelines API rate limit."""
 
-# COMMAND ----------
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
 
-# Dim Warehouse
-dim_warehouse_update = w.pipelines.start_update(pipeline_id=dim_warehouse_pipeline_id, full_refresh=True)
-print(f"Dim Warehouse update ID: {dim_warehouse_update.update_id}")
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
 
-# COMMAND ----------
 
-# Inventory Transactions
-inventory_transaction_update = w.pipelines.start_update(pipeline_id=inventory_transaction_pipeline_id, full_refresh=True)
-print(f"Inventory Transactions update ID: {inventory_transaction_update.update_id}")
+rate_limiter = TokenBucket(rate=5, capacity=5)
+
+
+def start_update(pipeline_id: str):
+    rate_limiter.acquire()
+    return w.pipelines.start_update(pipeline_id=pipeline_id, full_refresh=True)
 
 # COMMAND ----------
 
-# Inventory Historical
-inventory_historical_update = w.pipelines.start_update(pipeline_id=inventory_historical_pipeline_id, full_refresh=True)
-print(f"Inventory Historical update ID: {inventory_historical_update.update_id}")
\ No newline at end of file
+# Trigger all pipeline updates concurrently - they are independent of each other
+with ThreadPoolExecutor(max_workers=len(pipelines)) as executor:
+    futures = {name: executor.submit(start_update, pipeline_id) for name, pipeline_id in pipelines.items()}
+
+for name, future in futures.items():
+    print(f"{name} update ID: {future.result().update_id}")
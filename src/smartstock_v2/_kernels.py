@@ -0,0 +1,141 @@
+"""
+Compiled kernels for the bronze data generator.
+
+Kept in a plain module next to the notebooks so numba can cache the compiled
+code on disk (cache=True needs a real source file) and later notebook runs skip
+the JIT step. Without numba installed the kernels run as plain Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit('void(i8)', cache=True)
+def seed_kernels(seed):
+    """Seed the random state used inside compiled kernels, which is separate from NumPy's."""
+    np.random.seed(seed)
+
+
+@njit(
+    'i8(i8[:, :, :], i8[:, :, :], i8[:], i8[:], i8, i8[:], i8[:], i8[:], i8[:])',
+    cache=True
+)
+def check_reorders(inv, last_reorder, mat_hash, reorder_level, current_day,
+                   out_mat_idx, out_plant_idx, out_loc_idx, out_qty):
+    """
+    Scan the (material, plant, storage location) inventory for one business day.
+    Triggered reorders are booked into inv/last_reorder and written to the out
+    arrays; returns how many were written.
+    """
+    n_materials, n_plants, n_locations = inv.shape
+    count = 0
+    for m in range(n_materials):
+        tier = mat_hash[m]
+        level = reorder_level[m]
+        for p in range(n_plants):
+            for l in range(n_locations):
+                current_inv = inv[m, p, l]
+                if current_inv > level * 3:
+                    continue
+
+                # Skip reorders based on tier - let poorly managed items run out!
+                # CRITICAL 95%, URGENT 85%, ATTENTION 65%, MEDIUM 30%, HEALTHY never
+                if tier < 10:
+                    skip = 0.95
+                elif tier < 25:
+                    skip = 0.85
+                elif tier < 45:
+                    skip = 0.65
+                elif tier < 70:
+                    skip = 0.30
+                else:
+                    skip = 0.0
+                if skip > 0.0 and np.random.random() < skip:
+                    continue
+
+                # At most one reorder every 14 days per location (-1 = never reordered)
+                last = last_reorder[m, p, l]
+                if last >= 0 and current_day - last < 14:
+                    continue
+
+                if current_inv == 0:  # CRITICAL: Complete stockout
+                    qty = np.random.randint(200, 301)
+                elif current_inv < level * 2:  # URGENT: Very low stock
+                    qty = np.random.randint(150, 251)
+                elif current_inv < level * 5:  # LOW: Below reorder point
+                    qty = np.random.randint(100, 181)
+                else:  # NORMAL: Proactive reorder
+                    qty = np.random.randint(80, 121)
+
+                # Poorly managed tiers get MUCH smaller orders
+                if tier < 10:
+                    qty = int(qty * 0.2)
+                elif tier < 25:
+                    qty = int(qty * 0.35)
+                elif tier < 45:
+                    qty = int(qty * 0.55)
+
+                inv[m, p, l] += qty
+                last_reorder[m, p, l] = current_day
+                out_mat_idx[count] = m
+                out_plant_idx[count] = p
+                out_loc_idx[count] = l
+                out_qty[count] = qty
+                count += 1
+    return count
+
+
+@njit(
+    'i8(i8[:, :, :], i8[:, :, :], i8[:], i8[:], b1[:], i8[:], i8[:], i8[:], i8[:], '
+    'b1[:], b1[:], f8[:], i8[:], i8[:], i8[:], i8[:], i8[:], i8[:])',
+    cache=True
+)
+def simulate_days(inv, last_reorder, mat_hash, reorder_level, is_business_day, day_item_end,
+                  item_material, item_plant, item_lgort, item_is_sale, item_credit, item_u, item_qty,
+                  out_day, out_mat_idx, out_plant_idx, out_loc_idx, out_qty):
+    """
+    Run the stock simulation over all days in one pass.
+
+    Each business day starts with the reorder check, then the day's items
+    (day_item_end holds the cumulative item count per day) are booked in order.
+    Sale quantities are capped by the stock on hand and sized from item_u; all
+    other item quantities and directions are given. Reorders are written to the
+    out arrays; returns how many there were.
+    """
+    n_reorders = 0
+    start = 0
+    for day in range(is_business_day.shape[0]):
+        if is_business_day[day]:
+            count = check_reorders(
+                inv, last_reorder, mat_hash, reorder_level, day,
+                out_mat_idx[n_reorders:], out_plant_idx[n_reorders:],
+                out_loc_idx[n_reorders:], out_qty[n_reorders:]
+            )
+            out_day[n_reorders:n_reorders + count] = day
+            n_reorders += count
+
+        end = day_item_end[day]
+        for i in range(start, end):
+            m = item_material[i]
+            p = item_plant[i]
+            l = item_lgort[i]
+            current_inv = inv[m, p, l]
+
+            # Sales can't ship more than is in stock (at most 10 per line)
+            if item_is_sale[i]:
+                max_qty = min(current_inv, 10)
+                item_qty[i] = 1 + int(item_u[i] * max_qty) if max_qty > 0 else 0
+
+            qty = item_qty[i]
+            if qty > 0:
+                change = qty if item_credit[i] else -qty
+                inv[m, p, l] = max(0, current_inv + change)
+        start = end
+    return n_reorders
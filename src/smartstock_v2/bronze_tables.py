@@ -2,9 +2,11 @@
 # At the top of each notebook
 dbutils.widgets.text("catalog", "demo_nnguyen")
 dbutils.widgets.text("env", "dev")
+dbutils.widgets.text("staging_volume", "bronze_staging")
 
 catalog = dbutils.widgets.get("catalog")
 env = dbutils.widgets.get("env")
+staging_volume = dbutils.widgets.get("staging_volume")
 
 # COMMAND ----------
 
@@ -16,31 +18,41 @@ Generates realistic SAP-like raw data with quality issues, duplicates, and incon
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
-import hashlib
 import uuid
 from typing import List, Dict, Tuple
 import json
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+from _kernels import seed_kernels, simulate_days
 
 # COMMAND ----------
 
 spark.sql(f"USE CATALOG {catalog}")
 spark.sql("USE SCHEMA smartstock")
+# Generated frames are staged as Parquet in this volume and loaded by Spark's native reader
+spark.sql(f"CREATE VOLUME IF NOT EXISTS {staging_volume}")
+staging_path = f"/Volumes/{catalog}/smartstock/{staging_volume}"
+# Read the staged (timezone-naive) timestamps as TIMESTAMP, like createDataFrame does
+spark.conf.set("spark.sql.parquet.inferTimestampNTZ.enabled", "false")
 
 # COMMAND ----------
 
 class BronzeDataGenerator:
     """Generates SAP-like raw data for bronze layer with realistic data quality issues."""
     
-    def __init__(self):
-        """Initialize the bronze data generator."""
+    def __init__(self, seed: int = 42):
+        """Initialize the bronze data generator with a seeded random stream for reproducibility."""
+        self.rng = np.random.default_rng(seed)
+        seed_kernels(seed)  # Compiled kernels keep their own random state
+        
         self.end_date = datetime.now()
         self.start_date = self.end_date - timedelta(days=3*365)
         
+        # All rows of one generator run share a logical ingestion time
+        self._now = datetime.now()
+        self._now_stamp = self._now.strftime("%Y%m%d%H%M%S")
+        
         # SAP-like system identifiers
         self.source_systems = {
             'PRD': 'SAP_PRODUCTION_EU',
@@ -64,6 +76,12 @@ class BronzeDataGenerator:
             '711': {'type': 'adjustment', 'desc': 'Posting Change in Stock - Phys Inv', 'frequency': 0.00}
         }
         
+        # Columnar view of the movement types for bulk sampling
+        self._bwart_codes = np.array(list(self.movement_types.keys()))
+        self._bwart_kinds = np.array([mt['type'] for mt in self.movement_types.values()])
+        self._bwart_descs = np.array([mt['desc'] for mt in self.movement_types.values()])
+        self._bwart_cdf = self._cdf([mt['frequency'] for mt in self.movement_types.values()])
+        
         # SAP Plants (WERKS)
         self.plants = {
             'FR01': {'name': 'Lyon Main Warehouse', 'country': 'FR', 'city': 'Lyon'},
@@ -74,6 +92,12 @@ class BronzeDataGenerator:
         # Storage Locations (LGORT)
         self.storage_locations = ['0001'] # only one storage location for demo purposes
         
+        # Value pools for material document users (USNAM), transaction codes (TCODE)
+        # and movement reasons (GRUND)
+        self._users = np.array(['JSMITH', 'MJONES', 'RWILSON', 'KBROWN', 'LDAVIS'])
+        self._tcodes = np.array(['MIGO', 'MB1A', 'MB1B', 'MB1C'])
+        self._grunds = np.array(['', '0001', '0002', 'QC', 'DMG'])
+        
         # Product categories mapping
         self.product_categories = {
             'MOTOR': {'matkl': 'MOT', 'mtart': 'HAWA', 'count': 4},
@@ -86,78 +110,98 @@ class BronzeDataGenerator:
             'ACCESSORY': {'matkl': 'ACC', 'mtart': 'NORM', 'count': 10}
         }
         
+        # Base reorder level per product category
+        self.reorder_levels = {
+            'MOTOR': 15, 'BATTERY': 30, 'FRAME': 10,
+            'WHEEL': 25, 'BRAKE': 30, 'ELECTRONIC': 35,
+            'DRIVETRAIN': 30, 'ACCESSORY': 50
+        }
+        
         self.materials = []
         self.batch_counter = 0
+        self._reorder_level = None  # Per-material reorder level, aligned with self.materials
+        self._mat_hash = None       # Per-material health tier (0-99), aligned with self.materials
 
-        self.inventory_levels = {}  # Track inventory
-        self.reorder_history = {}   # Track last reorder dates
+        self._inventory_keys = []   # (matnr, plant, lgort) of every flattened inventory cell
+        self._inventory = None      # (material, plant, lgort) stock while simulating
+        self._last_reorder = None   # Day offset of the last reorder per location
+        
+        # Lookup arrays turning simulation indices back into SAP keys
+        self._matnrs = None
+        self._plant_codes = np.array(list(self.plants.keys()))
+        self._lgorts = np.array(self.storage_locations)
+
+    @property
+    def inventory_levels(self) -> Dict[Tuple[str, str, str], int]:
+        """Current stock per (matnr, plant, lgort), read from the simulation array."""
+        if self._inventory is None:
+            return {}
+        return dict(zip(self._inventory_keys, self._inventory.ravel().tolist()))
 
     def initialize_inventory(self):
         """Initialize inventory levels after materials are generated."""
-        for material in self.materials:
-            # Get reorder level from category mapping
-            category = material['category']
-            base_reorder = {
-                'MOTOR': 15, 'BATTERY': 30, 'FRAME': 10,
-                'WHEEL': 25, 'BRAKE': 30, 'ELECTRONIC': 35,
-                'DRIVETRAIN': 30, 'ACCESSORY': 50
-            }.get(category, 20)
-
-            # Assign each material to a health tier based on hash
-            material_hash = hash(material['matnr']) % 100
-            
-            for plant_idx, plant in enumerate(self.plants.keys()):
-                # Warehouse capacity multipliers
-                if plant_idx == 0: # FR01 Lyon - high capacity
-                    capacity_mult = random.uniform(1.2, 1.6)
-                elif plant_idx == 1: # DE01 Hamburg - medium
-                    capacity_mult = random.uniform(0.9, 1.3)
-                else:
-                    capacity_mult = random.uniform(0.7, 1.1)
-
-                for lgort in self.storage_locations:
-                    key = (material['matnr'], plant, lgort)
-                    
-                    # Create tiered inventory health
-                    if material_hash < 10:  # 10% - CRITICAL (will stockout within 30 days)
-                        base_stock = base_reorder * random.uniform(0.5, 1.5)
-                    elif material_hash < 25:  # 15% - URGENT (below reorder in 30 days)
-                        base_stock = base_reorder * random.uniform(1.5, 2.5)
-                    elif material_hash < 45:  # 20% - ATTENTION (below reorder in 60 days)
-                        base_stock = base_reorder * random.uniform(2.5, 4.0)
-                    else:  # 55% - HEALTHY
-                        base_stock = base_reorder * random.uniform(4.0, 8.0)
-
-                    self.inventory_levels[key] = int(base_stock * capacity_mult)
-        
-    def generate_material_number(self, category: str, index: int) -> str:
-        """Generate SAP-like material number (MATNR)."""
-        category_prefix = self.product_categories[category]['matkl']
-        # Format: MATKL + 7-digit number (e.g., MOT0000001)
-        return f"{category_prefix}{str(index).zfill(7)}"
+        self._precompute_material_state()
+        material_hash = self._mat_hash
+
+        # Create tiered inventory health:
+        #   10% CRITICAL (will stockout within 30 days), 15% URGENT (below reorder in 30 days),
+        #   20% ATTENTION (below reorder in 60 days), 55% HEALTHY
+        tiers = [material_hash < 10, material_hash < 25, material_hash < 45]
+        low = np.select(tiers, [0.5, 1.5, 2.5], default=4.0)
+        high = np.select(tiers, [1.5, 2.5, 4.0], default=8.0)
+
+        # Warehouse capacity multipliers: FR01 Lyon high, DE01 Hamburg medium, others low
+        plants = list(self.plants.keys())
+        plant_ranges = [(1.2, 1.6), (0.9, 1.3)] + [(0.7, 1.1)] * (len(plants) - 2)
+        cap_low, cap_high = np.array(plant_ranges).T
+        n_materials, n_plants, n_locations = len(self.materials), len(plants), len(self.storage_locations)
+        capacity_mult = self.rng.uniform(cap_low, cap_high, size=(n_materials, n_plants))
+
+        base_stock = self._reorder_level[:, None, None] * self.rng.uniform(
+            low[:, None, None], high[:, None, None], size=(n_materials, n_plants, n_locations)
+        )
+        inventory = (base_stock * capacity_mult[:, :, None]).astype(np.int64)
+
+        self._inventory_keys = [
+            (matnr, plant, lgort)
+            for matnr in self._matnrs.tolist()
+            for plant in plants
+            for lgort in self.storage_locations
+        ]
+        self._inventory = inventory
+        self._last_reorder = np.full(inventory.shape, -1, dtype=np.int64)
+        
+    def _precompute_material_state(self):
+        """Cache per-material keys, reorder levels and health tiers used by the simulation."""
+        self._matnrs = np.array([m['matnr'] for m in self.materials])
+        self._reorder_level = np.fromiter(
+            (self.reorder_levels.get(m['category'], 20) for m in self.materials),
+            dtype=np.int64, count=len(self.materials)
+        )
+        # Assign each material to a health tier based on a stable hash (str hash() is salted per process)
+        self._mat_hash = np.fromiter(
+            (zlib.crc32(m['matnr'].encode()) % 100 for m in self.materials),
+            dtype=np.int64, count=len(self.materials)
+        )
     
-    def generate_batch_id(self) -> str:
-        """Generate unique batch ID for data ingestion."""
-        self.batch_counter += 1
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"BATCH_{timestamp}_{str(self.batch_counter).zfill(6)}"
+    def generate_batch_ids(self, n: int) -> np.ndarray:
+        """Generate n consecutive batch IDs for data ingestion."""
+        counters = np.arange(self.batch_counter + 1, self.batch_counter + n + 1)
+        self.batch_counter += n
+        return np.char.mod(f"BATCH_{self._now_stamp}_%06d", counters)
     
-    def get_ingestion_metadata(self, source_system: str = 'PRD') -> Dict:
-        """Generate ingestion metadata."""
-        return {
-            '_source_system': self.source_systems[source_system],
-            '_ingestion_time': datetime.now(),
-            '_batch_id': self.generate_batch_id()
-        }
+    def add_ingestion_metadata(self, df: pd.DataFrame, source_system: str = 'PRD') -> pd.DataFrame:
+        """Append ingestion metadata columns; source and time are broadcast, batch IDs are per row."""
+        df['_source_system'] = self.source_systems[source_system]
+        df['_ingestion_time'] = self._now
+        df['_batch_id'] = self.generate_batch_ids(len(df))
+        return df
     
     def generate_bronze_mara(self) -> pd.DataFrame:
         """
         Generate SAP MARA table (Material Master General Data).
         Includes realistic data quality issues: duplicates, nulls, inconsistencies.
         """
-        materials = []
-        material_counter = 1
-        
         # Product definitions matching the gold layer
         product_definitions = [
             # Motors
@@ -218,91 +262,80 @@ class BronzeDataGenerator:
             {'category': 'ACCESSORY', 'name': 'Wire Harness Main', 'desc': 'Main electrical wiring harness', 'weight': 0.32}
         ]
         
-        base_date = datetime(2021, 12, 1, 9, 0, 0)
+        n = len(product_definitions)
+        categories = np.array([prod['category'] for prod in product_definitions])
+        matkls = np.array([self.product_categories[c]['matkl'] for c in categories])
+        mtarts = np.array([self.product_categories[c]['mtart'] for c in categories])
+        names = np.array([prod['name'] for prod in product_definitions])
         
-        for i, prod in enumerate(product_definitions):
-            matnr = self.generate_material_number(prod['category'], material_counter)
-            category = prod['category']
-            
-            # Introduce data quality issues (5% of records have issues) (Skipped now for the demo)
-            # has_quality_issue = random.random() < 0.05
-            
-            material = {
-                'MATNR': matnr,
-                # 'MAKTX': prod['name'] if not (has_quality_issue and random.random() < 0.3) else None,  # 1.5% null names
-                'MAKTX': prod['name'],
-                'MEINS': 'PCE' if prod['category'] != 'ACCESSORY' else random.choice(['PCE', 'SET', 'KIT']),
-                'MTART': self.product_categories[category]['mtart'],
-                'MATKL': self.product_categories[category]['matkl'],
-                # 'BRGEW': prod['weight'] if not (has_quality_issue and random.random() < 0.2) else None,  # 1% null weights
-                'BRGEW': prod['weight'],
-                'GEWEI': 'KG',
-                'ERSDA': (base_date + timedelta(hours=i)).strftime('%Y%m%d'),
-                'LAEDA': (base_date + timedelta(days=random.randint(0, 365))).strftime('%Y%m%d'),
-                'ERNAM': random.choice(['JSMITH', 'MJONES', 'RWILSON', 'KBROWN']),
-            }
-            
-            # Add ingestion metadata
-            material.update(self.get_ingestion_metadata())
-            
-            materials.append(material)
-            self.materials.append({'matnr': matnr, 'category': category, 'name': prod['name']})
-            material_counter += 1
-            
-            # Introduce duplicates (2% chance)
-            if random.random() < 0.02:
-                duplicate = material.copy()
-                duplicate['_batch_id'] = self.generate_batch_id()
-                duplicate['_ingestion_time'] = datetime.now() + timedelta(minutes=random.randint(1, 60))
-                # Slight variation in duplicate to make it realistic
-                if duplicate['MAKTX']:
-                    duplicate['MAKTX'] = duplicate['MAKTX'] + ' '  # Trailing space
-                materials.append(duplicate)
-        
-        return pd.DataFrame(materials)
+        # Format: MATKL + 7-digit number (e.g., MOT0000001)
+        matnrs = np.char.add(matkls, np.char.zfill(np.arange(1, n + 1).astype(str), 7))
+        
+        # Creation one hour apart from the base date, last change up to a year later
+        base_date = np.datetime64('2021-12-01T09:00')
+        ersda = (base_date + np.arange(n).astype('timedelta64[h]')).astype('datetime64[D]')
+        laeda = base_date.astype('datetime64[D]') + self.rng.integers(0, 366, n).astype('timedelta64[D]')
+        
+        # Data quality issues (null names/weights) are skipped for the demo
+        df = pd.DataFrame({
+            'MATNR': matnrs,
+            'MAKTX': names,
+            'MEINS': np.where(categories == 'ACCESSORY', self.rng.choice(['PCE', 'SET', 'KIT'], n), 'PCE'),
+            'MTART': mtarts,
+            'MATKL': matkls,
+            'BRGEW': [prod['weight'] for prod in product_definitions],
+            'GEWEI': 'KG',
+            'ERSDA': pd.DatetimeIndex(ersda).strftime('%Y%m%d'),
+            'LAEDA': pd.DatetimeIndex(laeda).strftime('%Y%m%d'),
+            'ERNAM': self.rng.choice(['JSMITH', 'MJONES', 'RWILSON', 'KBROWN'], n),
+        })
+        
+        # Add ingestion metadata
+        self.add_ingestion_metadata(df)
+        
+        self.materials = [
+            {'matnr': matnr, 'category': category, 'name': name}
+            for matnr, category, name in zip(matnrs.tolist(), categories.tolist(), names.tolist())
+        ]
+        
+        # Introduce duplicates (2% chance), re-ingested later with a trailing space in the name
+        duplicates = df[self.rng.random(n) < 0.02].copy()
+        duplicates['_batch_id'] = self.generate_batch_ids(len(duplicates))
+        duplicates['_ingestion_time'] = self._now + pd.to_timedelta(self.rng.integers(1, 61, len(duplicates)), unit='m')
+        duplicates['MAKTX'] = duplicates['MAKTX'] + ' '
+        
+        return pd.concat([df, duplicates], ignore_index=True)
     
     def generate_bronze_marc(self) -> pd.DataFrame:
         """Generate SAP MARC table (Material Plant Data)."""
-        plant_data = []
-        
-        for material in self.materials:
-            for plant_code in self.plants.keys():
-                # Not all materials in all plants (80% coverage)
-                if random.random() < 0.8:
-                    
-                    # Reorder levels based on category
-                    category = material['category']
-                    base_reorder = {
-                        'MOTOR': 15, 'BATTERY': 30, 'FRAME': 10,
-                        'WHEEL': 25, 'BRAKE': 30, 'ELECTRONIC': 35,
-                        'DRIVETRAIN': 30, 'ACCESSORY': 50
-                    }.get(category, 20)
-                    
-                    reorder_point = base_reorder * random.uniform(0.8, 1.2)
-                    
-                    plant_record = {
-                        'MATNR': material['matnr'],
-                        'WERKS': plant_code,
-                        'MINBE': round(reorder_point, 0),
-                        'EISBE': round(reorder_point * 0.5, 0),  # Safety stock = 50% of reorder
-                        'BSTMI': round(reorder_point * 2, 0),  # Min lot size
-                        'BSTMA': round(reorder_point * 10, 0),  # Max lot size
-                        'DISPO': random.choice(['001', '002', '003']),
-                        'BESKZ': 'F',  # External procurement
-                        'ERSDA': datetime(2022, 1, 1).strftime('%Y%m%d')
-                    }
-                    
-                    # Add ingestion metadata
-                    plant_record.update(self.get_ingestion_metadata())
-                    
-                    plant_data.append(plant_record)
-        
-        return pd.DataFrame(plant_data)
+        matnrs = np.array([material['matnr'] for material in self.materials])
+        plants = np.array(list(self.plants.keys()))
+        shape = (len(matnrs), len(plants))
+        
+        # Reorder levels based on category
+        base_reorder = np.array([self.reorder_levels.get(m['category'], 20) for m in self.materials])
+        reorder_point = base_reorder[:, None] * self.rng.uniform(0.8, 1.2, shape)
+        
+        # Not all materials in all plants (80% coverage)
+        rows, cols = np.nonzero(self.rng.random(shape) < 0.8)
+        reorder_point = reorder_point[rows, cols]
+        
+        df = pd.DataFrame({
+            'MATNR': matnrs[rows],
+            'WERKS': plants[cols],
+            'MINBE': np.round(reorder_point, 0),
+            'EISBE': np.round(reorder_point * 0.5, 0),  # Safety stock = 50% of reorder
+            'BSTMI': np.round(reorder_point * 2, 0),  # Min lot size
+            'BSTMA': np.round(reorder_point * 10, 0),  # Max lot size
+            'DISPO': self.rng.choice(['001', '002', '003'], len(rows)),
+            'BESKZ': 'F',  # External procurement
+            'ERSDA': datetime(2022, 1, 1).strftime('%Y%m%d')
+        })
+        
+        return self.add_ingestion_metadata(df)
     
     def generate_bronze_mbew(self) -> pd.DataFrame:
         """Generate SAP MBEW table (Material Valuation)."""
-        valuation_data = []
-        
         # Price mapping from gold layer
         price_mapping = {
             'E-Motor 250W Mid-Drive': 450.00,
@@ -348,39 +381,31 @@ class BronzeDataGenerator:
             'Wire Harness Main': 38.00
         }
         
-        for material in self.materials:
-            for plant_code in self.plants.keys():
-                # Use plant code as valuation area (BWKEY)
-                bwkey = plant_code
-                
-                base_price = price_mapping.get(material['name'], 100.00)
-                
-                # Add some variance to prices across plants
-                price_variance = random.uniform(0.95, 1.05)
-                moving_price = round(base_price * price_variance, 2)
-                
-                valuation = {
-                    'MATNR': material['matnr'],
-                    'BWKEY': bwkey,
-                    'VERPR': moving_price,
-                    'STPRS': round(base_price, 2),  # Standard price (no variance)
-                    'PEINH': 1,  # Price unit
-                    'VPRSV': 'V',  # Moving average price control
-                    'LBKUM': round(random.uniform(100, 1000), 2),  # Total valuated stock
-                    'SALK3': round(moving_price * random.uniform(100, 1000), 2)  # Value of stock
-                }
-                
-                # Add ingestion metadata
-                valuation.update(self.get_ingestion_metadata())
-                
-                valuation_data.append(valuation)
-        
-        return pd.DataFrame(valuation_data)
+        matnrs = np.array([material['matnr'] for material in self.materials])
+        # Use plant code as valuation area (BWKEY)
+        bwkeys = np.array(list(self.plants.keys()))
+        shape = (len(matnrs), len(bwkeys))
+        
+        base_price = np.array([price_mapping.get(m['name'], 100.00) for m in self.materials])[:, None]
+        
+        # Add some variance to prices across plants
+        moving_price = np.round(base_price * self.rng.uniform(0.95, 1.05, shape), 2)
+        
+        df = pd.DataFrame({
+            'MATNR': np.repeat(matnrs, len(bwkeys)),
+            'BWKEY': np.tile(bwkeys, len(matnrs)),
+            'VERPR': moving_price.ravel(),
+            'STPRS': np.round(np.broadcast_to(base_price, shape), 2).ravel(),  # Standard price (no variance)
+            'PEINH': 1,  # Price unit
+            'VPRSV': 'V',  # Moving average price control
+            'LBKUM': np.round(self.rng.uniform(100, 1000, shape), 2).ravel(),  # Total valuated stock
+            'SALK3': np.round(moving_price * self.rng.uniform(100, 1000, shape), 2).ravel()  # Value of stock
+        })
+        
+        return self.add_ingestion_metadata(df)
     
     def generate_bronze_t001w(self) -> pd.DataFrame:
         """Generate SAP T001W table (Plants/Locations)."""
-        plant_data = []
-        
         plant_details = {
             'FR01': {
                 'NAME1': 'Lyon Main Warehouse',
@@ -411,102 +436,24 @@ class BronzeDataGenerator:
             }
         }
         
-        for werks, details in plant_details.items():
-            plant = {'WERKS': werks}
-            plant.update(details)
-            plant.update(self.get_ingestion_metadata())
-            plant_data.append(plant)
+        df = pd.DataFrame.from_dict(plant_details, orient='index').rename_axis('WERKS').reset_index()
         
-        return pd.DataFrame(plant_data)
+        return self.add_ingestion_metadata(df)
+    
+    @staticmethod
+    def _cdf(weights) -> np.ndarray:
+        """Normalized cumulative distribution of the given weights."""
+        cdf = np.cumsum(weights, dtype=float)
+        cdf /= cdf[-1]
+        cdf[-1] = 1.0  # Guard against rounding so every draw lands inside the table
+        return cdf
+    
+    def _sample_cdf(self, cdf: np.ndarray, size: int) -> np.ndarray:
+        """Draw `size` indices from a distribution given by its CDF."""
+        return np.searchsorted(cdf, self.rng.random(size), side='right')
     
-    def check_reorders_for_date(self, current_date, doc_counter):
-        """Check inventory and generate 101 movements for items below reorder point"""
-        reorder_docs = []
-        
-        for material in self.materials:
-            category = material['category']
-            reorder_level = {
-                'MOTOR': 15, 'BATTERY': 30, 'FRAME': 10,
-                'WHEEL': 25, 'BRAKE': 30, 'ELECTRONIC': 35,
-                'DRIVETRAIN': 30, 'ACCESSORY': 50
-            }.get(category, 20)
-
-
-            # Check material health tier
-            material_hash = hash(material['matnr']) % 100
-
-            for plant in self.plants.keys():
-                for lgort in self.storage_locations:
-                    key = (material['matnr'], plant, lgort)
-                    current_inv = self.inventory_levels.get(key, 0)
-                    
-                    if current_inv <= reorder_level * 3:
-                        # Skip reorders based on tier - let poorly managed items run out!
-                        if material_hash < 10:  # CRITICAL tier (10%)
-                            if random.random() < 0.95:  # Skip 95% of reorders!
-                                continue
-                        elif material_hash < 25:  # URGENT tier (15%)
-                            if random.random() < 0.85:  # Skip 85%
-                                continue
-                        elif material_hash < 45:  # ATTENTION tier (20%)
-                            if random.random() < 0.65:  # Skip 65%
-                                continue
-                        elif material_hash < 70:  # MEDIUM tier (25%)
-                            if random.random() < 0.30:  # Skip 30%
-                                continue
-                        # HEALTHY tier (30%) - no skip, always reorder
-
-                        last_reorder = self.reorder_history.get(key)
-
-                        can_reorder = False
-                        if last_reorder is None:
-                            can_reorder = True
-                        else:
-                            days_since = (current_date - last_reorder).days
-                            can_reorder = days_since >= 14
-
-                        if can_reorder:
-                            if current_inv == 0:
-                                # CRITICAL: Complete stockout
-                                # target_stock = reorder_level * random.uniform(25.0, 40.0)
-                                qty = random.randint(200, 300)
-                            elif current_inv < reorder_level * 2:
-                                # URGENT: Very low stock
-                                # target_stock = reorder_level * random.uniform(20.0, 35.0)
-                                qty = random.randint(150, 250)
-                            elif current_inv < reorder_level * 5:
-                                # LOW: Below reorder point
-                                # target_stock = reorder_level * random.uniform(15.0, 30.0)
-                                qty = random.randint(100, 180)
-                            else:
-                                # NORMAL: Proactive reorder
-                                # target_stock = reorder_level * random.uniform(10.0, 25.0)
-                                qty = random.randint(80, 120)
-
-                            # Poorly managed tiers get MUCH smaller orders
-                            if material_hash < 10:  # CRITICAL
-                                qty = int(qty * 0.2)  # Only 20% of normal order
-                            elif material_hash < 25:  # URGENT
-                                qty = int(qty * 0.35)  # Only 35%
-                            elif material_hash < 45:  # ATTENTION
-                                qty = int(qty * 0.55)  # Only 55%
-
-                            # Generate reorder (movement type 101)
-                            # qty = max(100, int(target_stock - current_inv))  # Minimum 50 units
-                            reorder_docs.append({
-                                'material': material,
-                                'plant': plant,
-                                'lgort': lgort,
-                                'quantity': qty,
-                                'date': current_date,
-                                'urgency': 'CRITICAL' if current_inv == 0 else
-                                          'URGENT' if current_inv < reorder_level * 0.5 else
-                                          'HIGH' if current_inv < reorder_level else 'NORMAL'
-                            })
-                            self.inventory_levels[key] += qty
-                            self.reorder_history[key] = current_date
-        
-        return reorder_docs
+    # SAP HHMMSS time strings indexed by second of day
+    _HHMMSS = np.char.mod('%06d', np.arange(24)[:, None, None] * 10000 + np.arange(60)[:, None] * 100 + np.arange(60)).ravel()
 
     def generate_bronze_mkpf_mseg(self, num_days: int = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -516,224 +463,189 @@ class BronzeDataGenerator:
         if num_days is None:
             num_days = (self.end_date - self.start_date).days
         
-        mkpf_records = []
-        mseg_records = []
-        
-        doc_counter = 1
-        current_date = self.start_date
-        
         print(f"Generating {num_days} days of transaction data...")
         
-        # Seasonal patterns
-        seasonal_patterns = {
-            1: 0.6, 2: 0.7, 3: 0.9, 4: 1.2, 5: 1.4, 6: 1.5,
-            7: 1.3, 8: 1.1, 9: 1.0, 10: 0.8, 11: 0.6, 12: 0.5
-        }
+        # Calendar of simulated days
+        dates = np.datetime64(self.start_date.date()) + np.arange(num_days)
+        months = dates.astype('datetime64[M]').astype(int) % 12 + 1
+        years = dates.astype('datetime64[Y]').astype(int) + 1970
+        weekdays = (dates.astype(int) + 3) % 7  # 1970-01-01 was a Thursday; Monday=0
+        # Per-day strings: SAP date (YYYYMMDD) and fiscal year
+        day_strs = np.char.replace(dates.astype(str), '-', '')
+        year_strs = years.astype(str)
+        # Batch numbers (CHARG) B + YYYYMM + 3 digits, by month of the day and suffix (0 = no batch)
+        month_strs, day_month = np.unique(np.char.replace(dates.astype('datetime64[M]').astype(str), '-', ''), return_inverse=True)
+        charg_table = np.char.add(np.char.add('B', month_strs)[:, None], np.char.mod('%03d', np.arange(1000)))
+        charg_table[:, 0] = ''
+        
+        # Seasonal patterns (index = month)
+        seasonal_patterns = np.array([0.0, 0.6, 0.7, 0.9, 1.2, 1.4, 1.5, 1.3, 1.1, 1.0, 0.8, 0.6, 0.5])
         
         # Growth trends (future years default to 1.2)
         growth_trends = {2022: 0.7, 2023: 0.9, 2024: 1.0, 2025: 1.1}
+        growth = np.array([growth_trends.get(year, 1.2) for year in range(years.min(), years.max() + 1)])
         
-        # Day of week patterns
-        dow_patterns = {0: 0.3, 1: 0.8, 2: 1.0, 3: 1.0, 4: 1.2, 5: 0.4, 6: 0.2}
+        # Day of week patterns (index = weekday)
+        dow_patterns = np.array([0.3, 0.8, 1.0, 1.0, 1.2, 0.4, 0.2])
         
-        for day in range(num_days):
-            if day % 100 == 0:
-                progress = (day / num_days) * 100
-                print(f"Progress: {progress:.1f}% - Processing {current_date.date()}")
-            
-            # Calculate daily activity level
-            seasonal = seasonal_patterns[current_date.month]
-            growth = growth_trends.get(current_date.year, 1.2)  # Default 1.2 for future years
-            dow = dow_patterns[current_date.weekday()]
-            
-            daily_activity = seasonal * growth * dow
-            base_transactions = int(50 * daily_activity)  # Base number of documents per day
-            num_transactions = max(1, int(np.random.poisson(base_transactions)))
-            
-            # Check for reorders (business days only)
-            if current_date.weekday() < 5:  # Monday=0, Friday=4
-                reorders = self.check_reorders_for_date(current_date, doc_counter)
-                
-                # Generate MKPF/MSEG records for reorders
-                for reorder in reorders:
-                    mblnr = str(doc_counter).zfill(10)
-                    mjahr = str(current_date.year)
-                    
-                    # Generate transaction time
-                    hour = random.randint(6, 18)
-                    minute = random.randint(0, 59)
-                    trans_time = current_date.replace(hour=hour, minute=minute, second=0)
-                    
-                    # MKPF Header for reorder
-                    mkpf = {
-                        'MBLNR': mblnr,
-                        'MJAHR': mjahr,
-                        'BLDAT': current_date.strftime('%Y%m%d'),
-                        'BUDAT': current_date.strftime('%Y%m%d'),
-                        'USNAM': 'REORDER',
-                        'TCODE': 'MIGO',
-                        'BKTXT': f"Reorder - Stock below level",
-                        'CPUDT': trans_time.strftime('%Y%m%d'),
-                        'CPUTM': trans_time.strftime('%H%M%S'),
-                        '_is_deleted': False
-                    }
-                    mkpf.update(self.get_ingestion_metadata())
-                    mkpf_records.append(mkpf)
-                    
-                    # MSEG Item for reorder
-                    mseg = {
-                        'MBLNR': mblnr,
-                        'MJAHR': mjahr,
-                        'ZEILE': '0001',
-                        'BWART': '101',  # GR for PO
-                        'MATNR': reorder['material']['matnr'],
-                        'WERKS': reorder['plant'],
-                        'LGORT': reorder['lgort'],
-                        'CHARG': '',
-                        'MENGE': reorder['quantity'],
-                        'MEINS': 'PCE',
-                        'SHKZG': 'S',
-                        'SOBKZ': '',
-                        'GRUND': '',
-                        'SGTXT': 'Reorder - Inventory replenishment',
-                        'CPUDT_MKPF': trans_time.strftime('%Y%m%d'),
-                        'CPUTM_MKPF': trans_time.strftime('%H%M%S')
-                    }
-                    mseg.update(self.get_ingestion_metadata())
-                    hash_string = f"{mblnr}{mjahr}1101{reorder['material']['matnr']}{reorder['plant']}{trans_time}"
-                    mseg['_record_hash'] = hashlib.md5(hash_string.encode()).hexdigest()
-                    mseg_records.append(mseg)
-                    
-                    doc_counter += 1
-
-
-            for trans in range(num_transactions):
-                # Generate material document number (MBLNR) - 10 digits
-                mblnr = str(doc_counter).zfill(10)
-                mjahr = str(current_date.year)
-                
-                # Select movement type
-                movement_types = list(self.movement_types.keys())
-                movement_weights = [self.movement_types[mt]['frequency'] for mt in movement_types]
-                bwart = random.choices(movement_types, weights=movement_weights)[0]
-                
-                # Generate transaction time
-                hour = random.choices(range(6, 19), weights=[0.5, 1.0, 1.0, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.5])[0]
-                minute = random.randint(0, 59)
-                second = random.randint(0, 59)
-                trans_time = current_date.replace(hour=hour, minute=minute, second=second)
-                
-                # MKPF Header
-                mkpf = {
-                    'MBLNR': mblnr,
-                    'MJAHR': mjahr,
-                    'BLDAT': current_date.strftime('%Y%m%d'),  # Document date
-                    'BUDAT': current_date.strftime('%Y%m%d'),  # Posting date
-                    'USNAM': random.choice(['JSMITH', 'MJONES', 'RWILSON', 'KBROWN', 'LDAVIS']),
-                    'TCODE': random.choice(['MIGO', 'MB1A', 'MB1B', 'MB1C']),
-                    'BKTXT': f"Mat Doc {mblnr}",
-                    'CPUDT': trans_time.strftime('%Y%m%d'),
-                    'CPUTM': trans_time.strftime('%H%M%S'),
-                    '_is_deleted': False  # Soft delete flag
-                }
-                
-                # Add ingestion metadata
-                mkpf.update(self.get_ingestion_metadata())
-                
-                # Introduce soft deletes (1% chance)
-                if random.random() < 0.01:
-                    mkpf['_is_deleted'] = True
-                
-                mkpf_records.append(mkpf)
-                
-                # Generate MSEG items (1-3 items per document)
-                num_items = random.choices([1, 2, 3], weights=[0.7, 0.25, 0.05])[0]
-                
-                for item_num in range(1, num_items + 1):
-                    # Select random material and plant
-                    material = random.choice(self.materials)
-                    plant = random.choice(list(self.plants.keys()))
-                    storage_loc = random.choice(self.storage_locations)
-
-
-                    # Generate inventory-aware quantity
-                    current_inv = self.inventory_levels.get((material['matnr'], plant, storage_loc), 0)
-                    reorder_level = material.get('reorder_level', 20)
-
-                    if self.movement_types[bwart]['type'] == 'inbound':
-                        quantity = random.randint(50, 400)
-                        shkzg = 'S'
-                    elif self.movement_types[bwart]['type'] == 'sale':
-                        max_qty = min(current_inv, 10)
-                        quantity = random.randint(1, max(1, max_qty)) if max_qty > 0 else 0
-                        shkzg = 'H'
-                    else:  # adjustment
-                        quantity = random.randint(1, 10)
-                        shkzg = random.choice(['S', 'H'])
-
-                    # Update inventory tracking
-                    if quantity > 0:
-                        change = quantity if shkzg == 'S' else -quantity
-                        key = (material['matnr'], plant, storage_loc)
-                        self.inventory_levels[key] = max(0, current_inv + change)
-
-                    # Generate quantity based on movement type
-                    '''if self.movement_types[bwart]['type'] == 'inbound':
-                        quantity = random.randint(10, 50)
-                        shkzg = 'S'  # Credit
-                    elif self.movement_types[bwart]['type'] == 'sale':
-                        quantity = random.randint(5, 25)
-                        shkzg = 'H'  # Debit
-                    else:  # adjustment
-                        quantity = random.randint(1, 10)
-                        shkzg = random.choice(['S', 'H'])
-                    '''
-                    
-                    
-                    # Generate batch number (CHARG) for some items
-                    charg = f"B{current_date.strftime('%Y%m')}{str(random.randint(1, 999)).zfill(3)}" if random.random() < 0.3 else ''
-                    
-                    mseg = {
-                        'MBLNR': mblnr,
-                        'MJAHR': mjahr,
-                        'ZEILE': str(item_num).zfill(4),  # Line item
-                        'BWART': bwart,
-                        'MATNR': material['matnr'],
-                        'WERKS': plant,
-                        'LGORT': storage_loc,
-                        'CHARG': charg,
-                        'MENGE': quantity,
-                        'MEINS': 'PCE',
-                        'SHKZG': shkzg,
-                        'SOBKZ': '',  # Special stock indicator (usually empty)
-                        'GRUND': random.choice(['', '0001', '0002', 'QC', 'DMG']) if random.random() < 0.1 else '',
-                        'SGTXT': self.movement_types[bwart]['desc'],
-                        'CPUDT_MKPF': trans_time.strftime('%Y%m%d'),
-                        'CPUTM_MKPF': trans_time.strftime('%H%M%S')
-                    }
-                    
-                    # Add ingestion metadata
-                    mseg.update(self.get_ingestion_metadata())
-                    
-                    # Generate record hash for deduplication
-                    hash_string = f"{mblnr}{mjahr}{item_num}{bwart}{material['matnr']}{plant}{trans_time}"
-                    mseg['_record_hash'] = hashlib.md5(hash_string.encode()).hexdigest()
-                    
-                    # Introduce duplicates (3% chance)
-                    mseg_records.append(mseg)
-                    if random.random() < 0.03:
-                        duplicate = mseg.copy()
-                        duplicate['_batch_id'] = self.generate_batch_id()
-                        duplicate['_ingestion_time'] = datetime.now() + timedelta(minutes=random.randint(1, 30))
-                        mseg_records.append(duplicate)
-                
-                doc_counter += 1
-            
-            current_date += timedelta(days=1)
+        # Daily activity level and number of documents per day around a base of 50
+        daily_activity = seasonal_patterns[months] * growth[years - years.min()] * dow_patterns[weekdays]
+        base_transactions = (50 * daily_activity).astype(int)
+        num_transactions = np.maximum(1, self.rng.poisson(base_transactions))
+        
+        # Regular documents: day, movement type (index into self._bwart_codes) and 1-3 line items
+        n_regular = int(num_transactions.sum())
+        doc_day = np.repeat(np.arange(num_days), num_transactions)
+        doc_bwart = self._sample_cdf(self._bwart_cdf, n_regular)
+        doc_items = self._sample_cdf(self._cdf([0.7, 0.25, 0.05]), n_regular) + 1
+        
+        # Regular items: owning document, line number and material/plant/location
+        n_regular_items = int(doc_items.sum())
+        item_doc = np.repeat(np.arange(n_regular), doc_items)
+        item_zeile = np.arange(n_regular_items) - np.repeat(np.cumsum(doc_items) - doc_items, doc_items) + 1
+        item_material = self.rng.integers(0, len(self._matnrs), n_regular_items)
+        item_plant = self.rng.integers(0, len(self._plant_codes), n_regular_items)
+        item_lgort = self.rng.integers(0, len(self._lgorts), n_regular_items)
+        
+        # Quantities that don't depend on stock are drawn up front: inbound 50-400 (credit),
+        # adjustments 1-10 in either direction; sales (debit) are sized during the simulation
+        item_kind = self._bwart_kinds[doc_bwart[item_doc]]
+        is_sale = item_kind == 'sale'
+        is_inbound = item_kind == 'inbound'
+        item_qty = np.where(
+            is_inbound, self.rng.integers(50, 401, n_regular_items), self.rng.integers(1, 11, n_regular_items)
+        ).astype(np.int64)
+        item_credit = is_inbound | (~is_sale & (self.rng.random(n_regular_items) < 0.5))
+        
+        # Simulate stock over all days: business-day reorders first, then the day's items in order
+        is_business_day = weekdays < 5  # Monday=0, Friday=4
+        day_item_end = np.cumsum(np.bincount(doc_day[item_doc], minlength=num_days))
+        max_reorders = int(is_business_day.sum()) * self._inventory.size
+        r_day, r_material, r_plant, r_lgort, r_qty = (np.empty(max_reorders, dtype=np.int64) for _ in range(5))
+        n_reorders = simulate_days(
+            self._inventory, self._last_reorder, self._mat_hash, self._reorder_level,
+            is_business_day, day_item_end, item_material, item_plant, item_lgort,
+            is_sale, item_credit, self.rng.random(n_regular_items), item_qty,
+            r_day, r_material, r_plant, r_lgort, r_qty
+        )
+        r_day, r_material, r_plant, r_lgort, r_qty = (
+            arr[:n_reorders] for arr in (r_day, r_material, r_plant, r_lgort, r_qty)
+        )
+        
+        # Documents run by day with each day's reorders ahead of its regular documents;
+        # MBLNR is the running number in that order
+        doc_order = np.argsort(np.concatenate([r_day, doc_day]), kind='stable')
+        n_docs = len(doc_order)
+        doc_rank = np.empty(n_docs, dtype=np.int64)
+        doc_rank[doc_order] = np.arange(n_docs)
+        h_day = np.concatenate([r_day, doc_day])[doc_order]
+        h_reorder = np.concatenate([np.ones(n_reorders, dtype=bool), np.zeros(n_regular, dtype=bool)])[doc_order]
+        # Introduce soft deletes (1% chance) on regular documents
+        h_deleted = np.concatenate([np.zeros(n_reorders, dtype=bool), self.rng.random(n_regular) < 0.01])[doc_order]
+        
+        # MSEG items: one 101 (GR for PO) line per reorder plus the regular items, in document order
+        i_doc = np.concatenate([doc_rank[:n_reorders], doc_rank[n_reorders + item_doc]])
+        item_order = np.argsort(i_doc, kind='stable')
+        
+        def in_item_order(reorder_values, regular_values):
+            return np.concatenate([np.broadcast_to(reorder_values, n_reorders), regular_values])[item_order]
+        
+        i_doc = i_doc[item_order]
+        i_zeile = in_item_order(1, item_zeile)
+        i_bwart = in_item_order(self._bwart_codes.tolist().index('101'), doc_bwart[item_doc])
+        i_matnr = in_item_order(r_material, item_material)
+        i_werks = in_item_order(r_plant, item_plant)
+        i_lgort = in_item_order(r_lgort, item_lgort)
+        i_menge = in_item_order(r_qty, item_qty)
+        i_credit = in_item_order(True, item_credit)
+        i_reorder = in_item_order(True, np.zeros(n_regular_items, dtype=bool))
+        # Batch number (CHARG) on ~30% of regular items, 0 = none
+        i_charg = in_item_order(0, np.where(
+            self.rng.random(n_regular_items) < 0.3, self.rng.integers(1, 1000, n_regular_items), 0
+        ))
+        # Introduce duplicates (3% chance), re-ingested 1-30 minutes later
+        i_dup_delay = in_item_order(0, np.where(
+            self.rng.random(n_regular_items) < 0.03, self.rng.integers(1, 31, n_regular_items), 0
+        ))
+        
+        # Format dates and times in bulk from the per-day strings
+        h_bldat = day_strs[h_day]
+        # Generate material document number (MBLNR) - 10 digits
+        h_mblnr = np.char.mod('%010d', np.arange(1, n_docs + 1))
+        
+        # Transaction times: reorders on the minute between 06:00 and 18:59,
+        # regular documents weighted towards business hours
+        h_secs = np.empty(n_docs, dtype=np.int64)
+        h_secs[h_reorder] = self.rng.integers(6, 19, n_reorders) * 3600 + self.rng.integers(0, 60, n_reorders) * 60
+        hour_cdf = self._cdf([0.5, 1.0, 1.0, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.5])
+        hours = 6 + self._sample_cdf(hour_cdf, n_regular)
+        h_secs[~h_reorder] = hours * 3600 + self.rng.integers(0, 60, n_regular) * 60 + self.rng.integers(0, 60, n_regular)
+        
+        # Users and transaction codes are only sampled for regular documents
+        
+        df_mkpf = pd.DataFrame({
+            'MBLNR': h_mblnr,
+            'MJAHR': year_strs[h_day],
+            'BLDAT': h_bldat,  # Document date
+            'BUDAT': h_bldat,  # Posting date
+            'USNAM': pd.Categorical(np.where(h_reorder, 'REORDER', self._users[self.rng.integers(0, len(self._users), n_docs)])),
+            'TCODE': pd.Categorical(np.where(h_reorder, 'MIGO', self._tcodes[self.rng.integers(0, len(self._tcodes), n_docs)])),
+            'BKTXT': np.where(h_reorder, "Reorder - Stock below level", np.char.add("Mat Doc ", h_mblnr)),
+            'CPUDT': h_bldat,
+            'CPUTM': self._HHMMSS[h_secs],
+            '_is_deleted': h_deleted,  # Soft delete flag
+        }, copy=False)
+        self.add_ingestion_metadata(df_mkpf)
+        
+        i_day = h_day[i_doc]
+        i_secs = h_secs[i_doc]
+        i_mblnr = h_mblnr[i_doc]
+        i_mjahr = year_strs[i_day]
+        i_matnr = self._matnrs[i_matnr]
+        
+        charg = charg_table[day_month[i_day], i_charg]
         
-        print(f"Generated {len(mkpf_records)} material documents with {len(mseg_records)} line items")
+        # Movement reason (GRUND) on ~10% of regular items
+        n_items = len(i_doc)
+        has_grund = ~i_reorder & (self.rng.random(n_items) < 0.1)
+        grund = np.where(has_grund, self._grunds[self.rng.integers(0, len(self._grunds), n_items)], '')
         
-        return pd.DataFrame(mkpf_records), pd.DataFrame(mseg_records)
+        df_mseg = pd.DataFrame({
+            'MBLNR': i_mblnr,
+            'MJAHR': i_mjahr,
+            'ZEILE': np.char.mod('%04d', i_zeile),
+            'BWART': pd.Categorical.from_codes(i_bwart, self._bwart_codes),
+            'MATNR': i_matnr,
+            'WERKS': pd.Categorical.from_codes(i_werks, self._plant_codes),
+            'LGORT': pd.Categorical.from_codes(i_lgort, self._lgorts),
+            'CHARG': charg,
+            'MENGE': i_menge,
+            'MEINS': 'PCE',
+            'SHKZG': pd.Categorical.from_codes(i_credit.astype(np.int8), ['H', 'S']),
+            'SOBKZ': '',  # Special stock indicator (usually empty)
+            'GRUND': grund,
+            'SGTXT': np.where(i_reorder, 'Reorder - Inventory replenishment', self._bwart_descs[i_bwart]),
+            'CPUDT_MKPF': h_bldat[i_doc],
+            'CPUTM_MKPF': self._HHMMSS[i_secs],
+        }, copy=False)  # Columns are fresh arrays, nothing to protect by copying
+        # Remaining low-cardinality code and text columns are stored as categories too
+        df_mseg[['MEINS', 'SOBKZ', 'GRUND', 'SGTXT']] = df_mseg[['MEINS', 'SOBKZ', 'GRUND', 'SGTXT']].astype('category')
+        self.add_ingestion_metadata(df_mseg)
+        
+        # Record hash for deduplication over the document keys and transaction date/time,
+        # viewed as signed int64 since Spark has no unsigned long
+        df_mseg['_record_hash'] = pd.util.hash_pandas_object(
+            df_mseg[['MBLNR', 'MJAHR', 'ZEILE', 'BWART', 'MATNR', 'WERKS', 'CPUDT_MKPF', 'CPUTM_MKPF']], index=False
+        ).to_numpy().view(np.int64)
+        
+        duplicates = df_mseg[i_dup_delay > 0].copy()
+        duplicates['_batch_id'] = self.generate_batch_ids(len(duplicates))
+        duplicates['_ingestion_time'] = self._now + pd.to_timedelta(i_dup_delay[i_dup_delay > 0], unit='m')
+        df_mseg = pd.concat([df_mseg, duplicates], ignore_index=True)
+        
+        print(f"Generated {len(df_mkpf)} material documents with {len(df_mseg)} line items")
+        
+        return df_mkpf, df_mseg
 
 # COMMAND ----------
 
@@ -744,12 +656,6 @@ generator = BronzeDataGenerator()
 df_mara = generator.generate_bronze_mara()
 display(df_mara)
 
-# COMMAND ----------
-
-spark_df_mara = spark.createDataFrame(df_mara)
-spark_df_mara.write.mode('overwrite').saveAsTable('bronze_mara')
-
-
 # COMMAND ----------
 
 # Initialize inventory after materials are generated
@@ -763,43 +669,48 @@ display(df_marc)
 
 # COMMAND ----------
 
-spark_df_marc = spark.createDataFrame(df_marc)
-spark_df_marc.write.mode('overwrite').saveAsTable('bronze_marc')
-
-# COMMAND ----------
-
 df_mbew = generator.generate_bronze_mbew()
 display(df_mbew)
 
 # COMMAND ----------
 
-spark_df_mbew = spark.createDataFrame(df_mbew)
-spark_df_mbew.write.mode("overwrite").saveAsTable("bronze_mbew")
-
-# COMMAND ----------
-
 df_t001w = generator.generate_bronze_t001w()
 display(df_t001w)
 
 # COMMAND ----------
 
-spark_df_t001w = spark.createDataFrame(df_t001w)
-spark_df_t001w.write.mode("overwrite").saveAsTable("bronze_t001w")
-
-# COMMAND ----------
-
 df_mkpf, df_mseg = generator.generate_bronze_mkpf_mseg()
 display(df_mkpf)
 display(df_mseg)
 
 # COMMAND ----------
 
-spark_df_mkpf = spark.createDataFrame(df_mkpf)
-spark_df_mkpf.write.mode("overwrite").saveAsTable("bronze_mkpf")
+bronze_tables = {
+    'bronze_mara': df_mara,
+    'bronze_marc': df_marc,
+    'bronze_mbew': df_mbew,
+    'bronze_t001w': df_t001w,
+    'bronze_mkpf': df_mkpf,
+    'bronze_mseg': df_mseg,
+}
+
+
+def write_bronze_table(name: str, df: pd.DataFrame):
+    path = f"{staging_path}/{name}.parquet"
+    # Spark's Parquet reader rejects nanosecond timestamps, so store them in microseconds
+    df.to_parquet(path, engine='pyarrow', compression='snappy', index=False,
+                  coerce_timestamps='us', allow_truncated_timestamps=True)
+    spark.read.parquet(path).write.mode("overwrite").saveAsTable(name)
+    dbutils.fs.rm(path)  # The table holds the data now; drop the staged copy
+
 
+# Write all tables concurrently - each write targets its own table
+with ThreadPoolExecutor(max_workers=len(bronze_tables)) as executor:
+    futures = {name: executor.submit(write_bronze_table, name, df) for name, df in bronze_tables.items()}
 
-spark_df_mseg = spark.createDataFrame(df_mseg)
-spark_df_mseg.write.mode("overwrite").saveAsTable("bronze_mseg") 
+for name, future in futures.items():
+    future.result()  # Re-raise any failed write
+    print(f"✅ {name} written")
 
 # COMMAND ----------
 